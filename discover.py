@@ -5,20 +5,49 @@ and displays BLE information as well as Sesame-specific information.
 """
 
 import asyncio
+import struct
+import uuid
 
-from gomalock.scanner import SesameScanner
+from bleak import BleakScanner
+
+_COMPANY_ID = 0x055A
+_SERVICE_UUID = "0000fd81-0000-1000-8000-00805f9b34fb"
+_PRODUCT_MODELS = {5: "Sesame 5", 7: "Sesame 5 Pro", 16: "Sesame 5 USA"}
+_SCAN_TIMEOUT = 30
 
 
 async def main():
     """Scan for Sesame BLE devices and print their information."""
-    print("-" * 50)
-    devices = await SesameScanner.discover(timeout=30)
-    for address, sesame_adv_data in devices.items():
-        print(f"{'Address':11}: {address}")
-        print(f"{'Model':11}: {sesame_adv_data.product_model.name}")
-        print(f"{'Registered':11}: {sesame_adv_data.is_registered}")
-        print(f"{'UUID':11}: {sesame_adv_data.device_uuid}")
-        print("-" * 50)
+    separator = "-" * 50
+    found: dict[str, bytes] = {}
+
+    def _on_advertisement(device, adv_data):
+        # Reject non-Sesame broadcasters on the company ID before any
+        # parsing; dense advertising environments hit this path a lot.
+        manufacturer_data = adv_data.manufacturer_data.get(_COMPANY_ID)
+        if manufacturer_data is None or len(manufacturer_data) < 19:
+            return
+        found[device.address] = manufacturer_data
+
+    async with BleakScanner(_on_advertisement, service_uuids=[_SERVICE_UUID]):
+        await asyncio.sleep(_SCAN_TIMEOUT)
+
+    sections = [separator]
+    for address, manufacturer_data in found.items():
+        # One C-level parse: product model (uint16 LE), registered flag,
+        # 16-byte device UUID.
+        model_id, is_registered, uuid_bytes = struct.unpack_from(
+            "<HB16s", manufacturer_data
+        )
+        model = _PRODUCT_MODELS.get(model_id, f"Unknown ({model_id})")
+        sections.append(
+            f"{'Address':11}: {address}\n"
+            f"{'Model':11}: {model}\n"
+            f"{'Registered':11}: {bool(is_registered)}\n"
+            f"{'UUID':11}: {uuid.UUID(bytes=uuid_bytes)}\n"
+            f"{separator}"
+        )
+    print("\n".join(sections))
 
 
 if __name__ == "__main__":
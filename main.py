@@ -5,20 +5,30 @@ and integrates them with an MQTT broker.
 """
 
 import asyncio
+import collections
 import contextlib
-import functools
-import json
+import enum
 import logging
 import signal
 import uuid
+from dataclasses import dataclass
 from typing import Any, Callable, Coroutine, Literal, NamedTuple
 
 import aiomqtt
 import gomalock
+import orjson
 from gomalock.exc import SesameConnectionError
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 logger = logging.getLogger(__name__)
 
+_STATUS_BATCH_LIMIT = 32
+_STATUS_QUEUE_SIZE = 256
+
 
 class _BridgeConfig(NamedTuple):
     host: str
@@ -41,14 +51,94 @@ class _StatusPayload(NamedTuple):
     mech_status: gomalock.Sesame5MechStatus
 
 
-class _ControlPayload(NamedTuple):
-    device_uuid: uuid.UUID
-    command: bytes
+@dataclass(slots=True)
+class _StatusMessage:
+    """JSON status message; field names are the published JSON keys."""
+
+    # pylint: disable=invalid-name
+    position: int
+    lockCurrentState: str
+    batteryVoltage: float
+    batteryLevel: int
+    statusLowBattery: bool
+    chargingState: str = "NOT_CHARGEABLE"
+
+
+class _SesameCommand(enum.IntEnum):
+    LOCK = 1
+    UNLOCK = 2
+
+
+_COMMAND_TABLE = {
+    b"LOCKED": _SesameCommand.LOCK,
+    b"UNLOCKED": _SesameCommand.UNLOCK,
+}
+
+
+class _SesameOps(NamedTuple):
+    lock: Callable[[str], Coroutine[Any, Any, Any]]
+    unlock: Callable[[str], Coroutine[Any, Any, Any]]
+
+
+class _RingQueue[T]:
+    """Bounded single-consumer queue that drops the oldest item when full.
+
+    Tailored replacement for asyncio.Queue on the status path: a deque plus
+    a single wakeup event instead of per-item waiter bookkeeping, raising
+    the asyncio.Queue exceptions so callers are interchangeable.
+    """
+
+    def __init__(self, maxlen: int) -> None:
+        self._items: collections.deque[T] = collections.deque(maxlen=maxlen)
+        self._not_empty = asyncio.Event()
+        self._all_done = asyncio.Event()
+        self._all_done.set()
+        self._unfinished = 0
+        self._is_shutdown = False
+
+    def put_nowait(self, item: T) -> None:
+        if self._is_shutdown:
+            raise asyncio.QueueShutDown
+        if len(self._items) == self._items.maxlen:
+            # A newer status supersedes the oldest one, so drop it.
+            self._items.popleft()
+            self._unfinished -= 1
+        self._items.append(item)
+        self._unfinished += 1
+        self._all_done.clear()
+        self._not_empty.set()
+
+    async def get(self) -> T:
+        while not self._items:
+            if self._is_shutdown:
+                raise asyncio.QueueShutDown
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self._items.popleft()
+
+    def get_nowait(self) -> T:
+        if not self._items:
+            if self._is_shutdown:
+                raise asyncio.QueueShutDown
+            raise asyncio.QueueEmpty
+        return self._items.popleft()
+
+    def task_done(self) -> None:
+        self._unfinished -= 1
+        if self._unfinished <= 0:
+            self._all_done.set()
+
+    async def join(self) -> None:
+        await self._all_done.wait()
+
+    def shutdown(self) -> None:
+        self._is_shutdown = True
+        self._not_empty.set()
 
 
 def _load_config() -> tuple[_BridgeConfig, tuple[_TargetDevice, ...]]:
-    with open("config.json", "r", encoding="utf8") as f:
-        user_config: dict = json.load(f)
+    with open("config.json", "rb") as f:
+        user_config: dict = orjson.loads(f.read())
     mqtt_config: dict = user_config["mqtt"]
     base_topic = mqtt_config.get("base_topic", "ssm2mqtt")
     if "/" in base_topic:
@@ -98,9 +188,6 @@ async def _configure_mqttc(
             reconnect=True,
         )
     )
-    await mqttc.subscribe(
-        f"{bridge_config.base_topic}/+/set", max_qos=aiomqtt.QoS.AT_LEAST_ONCE
-    )
     logger.info(
         "Connected to MQTT broker [host=%s, port=%d, base_topic=%s]",
         bridge_config.host,
@@ -110,26 +197,53 @@ async def _configure_mqttc(
     return mqttc
 
 
+async def _configure_subscriptions(
+    mqttc: aiomqtt.Client, control_topics: dict[str, uuid.UUID]
+) -> None:
+    # Subscribe once during setup; the control producer's message loop never
+    # re-sends SUBSCRIBE, so restarts of that task cost no broker round-trip.
+    for topic in control_topics:
+        await mqttc.subscribe(topic, max_qos=aiomqtt.QoS.AT_LEAST_ONCE)
+
+
 async def _configure_sesame(
     stack: contextlib.AsyncExitStack,
-    status_queue: asyncio.Queue[_StatusPayload],
+    status_queue: _RingQueue[_StatusPayload],
     target_devices: tuple[_TargetDevice, ...],
     reconnection_limit: int,
 ) -> dict[uuid.UUID, gomalock.Sesame5]:
-    connected_devices = {}
-    for address, secret_key in target_devices:
+    last_status: dict[uuid.UUID, tuple[Any, ...]] = {}
+    status_callback = _make_status_callback(
+        asyncio.get_running_loop(), status_queue, last_status
+    )
+
+    async def _connect(target: _TargetDevice) -> gomalock.Sesame5:
         sesame = await stack.enter_async_context(
             gomalock.Sesame5(
-                address,
-                secret_key,
-                functools.partial(_produce_status, status_queue),
+                target.address,
+                target.secret_key,
+                status_callback,
                 reconnection_limit,
             )
         )
-        device_uuid = sesame.sesame_advertisement_data.device_uuid
-        connected_devices[device_uuid] = sesame
-        logger.info("Connected to Sesame device [UUID=%s]", device_uuid)
-    return connected_devices
+        logger.info(
+            "Connected to Sesame device [UUID=%s]",
+            sesame.sesame_advertisement_data.device_uuid,
+        )
+        return sesame
+
+    # Connect in parallel; the login handshake of each device has idle gaps
+    # the loop can fill, so startup takes max() instead of sum() of latencies.
+    # A TaskGroup cancels and awaits the sibling connects when one fails, so
+    # the exit stack never unwinds while a _connect is still registering on it.
+    async with asyncio.TaskGroup() as tg:
+        connect_tasks = tuple(
+            tg.create_task(_connect(target)) for target in target_devices
+        )
+    return {
+        task.result().sesame_advertisement_data.device_uuid: task.result()
+        for task in connect_tasks
+    }
 
 
 async def _perform_sesame_command_with_retry[**P, T](
@@ -148,63 +262,124 @@ async def _perform_sesame_command_with_retry[**P, T](
             logger.exception("Command failed, retrying...")
 
 
-def _produce_status(
-    queue: asyncio.Queue[_StatusPayload],
-    sesame: gomalock.Sesame5,
-    status: gomalock.Sesame5MechStatus,
+def _make_status_callback(
+    loop: asyncio.AbstractEventLoop,
+    queue: _RingQueue[_StatusPayload],
+    last_status: dict[uuid.UUID, tuple[Any, ...]],
+) -> Callable[[gomalock.Sesame5, gomalock.Sesame5MechStatus], None]:
+    # Bind the hot attributes as locals so each BLE notification pays a
+    # LOAD_FAST instead of attribute lookups through a functools.partial.
+    put_nowait = queue.put_nowait
+    get_last = last_status.get
+    call_soon_threadsafe = loop.call_soon_threadsafe
+    # The log level is fixed before any device connects, so capture the
+    # DEBUG check once instead of paying the no-op logging call per message.
+    is_debug = logger.isEnabledFor(logging.DEBUG)
+
+    def _enqueue_status(payload: _StatusPayload) -> None:
+        try:
+            put_nowait(payload)
+        except asyncio.QueueShutDown:
+            logger.warning("Shutting down, status discarded")
+
+    def _produce_status(
+        sesame: gomalock.Sesame5, status: gomalock.Sesame5MechStatus
+    ) -> None:
+        device_uuid = sesame.sesame_advertisement_data.device_uuid
+        fields = (
+            status.position,
+            status.is_in_lock_range,
+            status.battery_voltage,
+            status.battery_percentage,
+            status.is_battery_critical,
+        )
+        if get_last(device_uuid) == fields:
+            if is_debug:
+                logger.debug("Status unchanged, not enqueued [UUID=%s]", device_uuid)
+            return
+        # Hand the payload over to the event loop; gomalock may invoke this
+        # callback from its BLE worker thread and _RingQueue is not
+        # thread-safe, so only the cheap field compare runs here.
+        call_soon_threadsafe(_enqueue_status, _StatusPayload(device_uuid, status))
+        last_status[device_uuid] = fields
+
+    return _produce_status
+
+
+async def _publish_status(
+    mqttc: aiomqtt.Client, topic: str, payload: bytes
 ) -> None:
-    payload = _StatusPayload(sesame.sesame_advertisement_data.device_uuid, status)
-    try:
-        queue.put_nowait(payload)
-    except asyncio.QueueShutDown:
-        logger.warning("Shutting down, status discarded")
+    # Status is telemetry: QoS 0 skips the broker ack entirely, and the
+    # retained message keeps the topic at the latest state for subscribers.
+    while True:
+        try:
+            await mqttc.publish(
+                topic,
+                payload,
+                qos=aiomqtt.QoS.AT_MOST_ONCE,
+                retain=True,
+            )
+            return
+        except aiomqtt.ConnectError:
+            await mqttc.connected()
 
 
 async def _consume_status(
-    queue: asyncio.Queue[_StatusPayload], mqttc: aiomqtt.Client, base_topic: str
+    queue: _RingQueue[_StatusPayload],
+    mqttc: aiomqtt.Client,
+    status_topics: dict[uuid.UUID, str],
 ) -> None:
+    is_debug = logger.isEnabledFor(logging.DEBUG)
     while True:
         try:
-            status = await queue.get()
+            batch = [await queue.get()]
         except asyncio.QueueShutDown:
             return
+        while len(batch) < _STATUS_BATCH_LIMIT:
+            try:
+                batch.append(queue.get_nowait())
+            except (asyncio.QueueEmpty, asyncio.QueueShutDown):
+                break
         try:
-            payload = json.dumps(
-                {
-                    "position": status.mech_status.position,
-                    "lockCurrentState": (
-                        "LOCKED" if status.mech_status.is_in_lock_range else "UNLOCKED"
-                    ),
-                    "batteryVoltage": status.mech_status.battery_voltage,
-                    "batteryLevel": status.mech_status.battery_percentage,
-                    "chargingState": "NOT_CHARGEABLE",
-                    "statusLowBattery": status.mech_status.is_battery_critical,
-                }
-            ).encode("utf-8")
-            is_duplicate = False
-            packet_id = next(mqttc.packet_ids)
-            while True:
-                try:
-                    await mqttc.publish(
-                        f"{base_topic}/{status.device_uuid}/get",
-                        payload,
-                        qos=aiomqtt.QoS.AT_LEAST_ONCE,
-                        packet_id=packet_id,
-                        duplicate=is_duplicate,
-                        retain=True,
+            # Newer status supersedes older, so keep only the latest per device.
+            latest = {status.device_uuid: status.mech_status for status in batch}
+            payloads = {
+                device_uuid: orjson.dumps(
+                    _StatusMessage(
+                        mech_status.position,
+                        "LOCKED" if mech_status.is_in_lock_range else "UNLOCKED",
+                        mech_status.battery_voltage,
+                        mech_status.battery_percentage,
+                        mech_status.is_battery_critical,
                     )
-                    break
-                except aiomqtt.ConnectError:
-                    is_duplicate = True
-                    await mqttc.connected()
-            logger.debug("Published status to MQTT [UUID=%s]", status.device_uuid)
+                )
+                for device_uuid, mech_status in latest.items()
+            }
+            await asyncio.gather(
+                *(
+                    _publish_status(mqttc, status_topics[device_uuid], payload)
+                    for device_uuid, payload in payloads.items()
+                )
+            )
+            if is_debug:
+                logger.debug(
+                    "Published status to MQTT [UUIDs=%s]",
+                    ", ".join(map(str, payloads)),
+                )
         finally:
-            queue.task_done()
+            for _ in batch:
+                queue.task_done()
 
 
-async def _produce_control(
-    queue: asyncio.Queue[_ControlPayload], mqttc: aiomqtt.Client
+async def _handle_control(
+    mqttc: aiomqtt.Client,
+    control_topics: dict[str, uuid.UUID],
+    device_ops: dict[uuid.UUID, _SesameOps],
+    history_name: str,
+    retry: bool,
+    in_flight_commands: set[asyncio.Task[Any]],
 ) -> None:
+    is_debug = logger.isEnabledFor(logging.DEBUG)
     async for message in mqttc.messages():
         # Handle messages up to QoS 1; QoS 2 messages are treated as QoS 1 by aiomqtt.
         if not isinstance(message, aiomqtt.PublishPacket):
@@ -214,70 +389,41 @@ async def _produce_control(
             if not isinstance(message.packet_id, int):
                 continue
             await mqttc.puback(message.packet_id)
-        try:
-            device_uuid = uuid.UUID(message.topic.split("/")[1])
-        except (IndexError, ValueError):
+        device_uuid = control_topics.get(message.topic)
+        if device_uuid is None:
             logger.warning("Invalid topic format [topic=%s]", message.topic)
             continue
-        try:
-            await queue.put(_ControlPayload(device_uuid, message.payload))
-        except asyncio.QueueShutDown:
-            logger.warning("Shutting down, command discarded")
-
-
-async def _consume_control(
-    queue: asyncio.Queue[_ControlPayload],
-    connected_devices: dict[uuid.UUID, gomalock.Sesame5],
-    history_name: str,
-    retry: bool,
-) -> None:
-    while True:
-        try:
-            control = await queue.get()
-        except asyncio.QueueShutDown:
-            return
-        try:
-            sesame = connected_devices.get(control.device_uuid)
-            if sesame is None:
-                logger.warning(
-                    "Invalid Sesame specified [UUID=%s]", control.device_uuid
-                )
-                continue
-            try:
-                command_str = control.command.decode("utf-8")
-            except UnicodeDecodeError:
-                logger.warning("Invalid encoded payload [UUID=%s]", control.device_uuid)
-                continue
-            match command_str.upper():
-                case "LOCKED":
-                    await _perform_sesame_command_with_retry(
-                        retry, sesame.lock, history_name
-                    )
-                    logger.debug(
-                        "Lock command succeeded [UUID=%s]", control.device_uuid
-                    )
-                case "UNLOCKED":
-                    await _perform_sesame_command_with_retry(
-                        retry, sesame.unlock, history_name
-                    )
-                    logger.debug(
-                        "Unlock command succeeded [UUID=%s]", control.device_uuid
-                    )
-                case _:
-                    logger.warning(
-                        "Invalid command for Sesame [UUID=%s, command=%s]",
-                        control.device_uuid,
-                        command_str,
-                    )
-        finally:
-            queue.task_done()
+        command = _COMMAND_TABLE.get(message.payload.upper())
+        if command is None:
+            # Only decode for the log message; valid payloads never need it.
+            logger.warning(
+                "Invalid command for Sesame [UUID=%s, command=%s]",
+                device_uuid,
+                message.payload.decode("utf-8", errors="replace"),
+            )
+            continue
+        ops = device_ops[device_uuid]
+        func = ops.lock if command is _SesameCommand.LOCK else ops.unlock
+        # Run the BLE command as a tracked task and shield it, so cancelling
+        # this loop at shutdown never aborts a lock mid-operation; main()
+        # awaits the in-flight tasks before tearing down the connections.
+        command_task = asyncio.ensure_future(
+            _perform_sesame_command_with_retry(retry, func, history_name)
+        )
+        in_flight_commands.add(command_task)
+        command_task.add_done_callback(in_flight_commands.discard)
+        await asyncio.shield(command_task)
+        if is_debug:
+            logger.debug(
+                "%s command succeeded [UUID=%s]", command.name.title(), device_uuid
+            )
 
 
 async def main() -> None:
     """Main entry point for ssm2mqtt application."""
     stop_event = asyncio.Event()
-    status_queue: asyncio.Queue[_StatusPayload] = asyncio.Queue()
-    control_queue: asyncio.Queue[_ControlPayload] = asyncio.Queue()
+    # Bounded drop-oldest ring since only the latest status report matters.
+    status_queue: _RingQueue[_StatusPayload] = _RingQueue(_STATUS_QUEUE_SIZE)
 
     bridge_config, target_devices = _load_config()
     _configure_log_level(bridge_config.log_level)
@@ -288,38 +434,58 @@ async def main() -> None:
         connected_devices = await _configure_sesame(
             stack, status_queue, target_devices, bridge_config.sesame_reconnection_limit
         )
+        status_topics = {
+            device_uuid: f"{bridge_config.base_topic}/{device_uuid}/get"
+            for device_uuid in connected_devices
+        }
+        control_topics = {
+            f"{bridge_config.base_topic}/{device_uuid}/set": device_uuid
+            for device_uuid in connected_devices
+        }
+        await _configure_subscriptions(mqttc, control_topics)
+        device_ops = {
+            device_uuid: _SesameOps(sesame.lock, sesame.unlock)
+            for device_uuid, sesame in connected_devices.items()
+        }
         tg = await stack.enter_async_context(asyncio.TaskGroup())
 
-        tasks = (
-            tg.create_task(
-                _consume_status(
-                    status_queue,
-                    mqttc,
-                    bridge_config.base_topic,
-                )
-            ),
-            tg.create_task(
-                _consume_control(
-                    control_queue,
-                    connected_devices,
-                    bridge_config.history_name,
-                    bridge_config.sesame_reconnection_limit > 0,
-                )
-            ),
-            tg.create_task(_produce_control(control_queue, mqttc)),
+        in_flight_commands: set[asyncio.Task[Any]] = set()
+        status_task = tg.create_task(
+            _consume_status(
+                status_queue,
+                mqttc,
+                status_topics,
+            )
+        )
+        control_task = tg.create_task(
+            _handle_control(
+                mqttc,
+                control_topics,
+                device_ops,
+                bridge_config.history_name,
+                bridge_config.sesame_reconnection_limit > 0,
+                in_flight_commands,
+            )
         )
         logger.info("ssm2mqtt is running")
 
         await stop_event.wait()
         logger.info("Shutting down ssm2mqtt")
         status_queue.shutdown()
-        control_queue.shutdown()
+        # Stop accepting new commands; the shielded in-flight ones keep
+        # running and are drained below before the connections close.
+        control_task.cancel()
         await asyncio.wait_for(status_queue.join(), timeout=10)
-        await asyncio.wait_for(control_queue.join(), timeout=10)
-        for task in tasks:
-            task.cancel()
+        if in_flight_commands:
+            await asyncio.wait_for(
+                asyncio.gather(*in_flight_commands), timeout=10
+            )
+        status_task.cancel()
     logger.info("ssm2mqtt has been shut down")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is None:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())